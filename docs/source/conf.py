@@ -61,13 +61,16 @@ autodoc_mock_imports = ["numpy", "matplotlib", "scipy"]
 # extensions coming with Sphinx (named "sphinx.ext.*") or your custom ones.
 extensions = [
     "sphinx.ext.napoleon",
-    "sphinx.ext.viewcode",
-    "numpydoc",
     "sphinx_copybutton",
     "sphinx.ext.mathjax",  # "sphinx_gallery.gen_gallery"
     "autoapi.extension"
 ]
 
+# The source-code links and the numpydoc docstring pass are only needed for the
+# published documentation. Set BUILD_FULL_DOCS=1 to enable them.
+if os.environ.get("BUILD_FULL_DOCS"):
+    extensions += ["sphinx.ext.viewcode", "numpydoc"]
+
 autoapi_type = "python"
 autoapi_dirs = ["../../soft4pes"]
 autodoc_typehints = "description"
@@ -75,14 +78,18 @@ autoapi_options = [
     "members",
     "show-inheritance",
     "show-module-summary",
-    "imported-members",
     "special-members",
 ]
 
 autoapi_python_class_content = "class"
-autoapi_keep_files = False
+autoapi_generate_api_docs = True
 autoapi_add_toctree_entry = False
 
+# Keep the generated API stubs between builds so that Sphinx only rebuilds the
+# pages of changed modules
+autoapi_keep_files = True
+autoapi_ignore = ["*/examples/*", "*/tests/*"]
+
 # from sphinx_gallery.sorting import ExplicitOrder
 
 # sphinx_gallery_conf = {
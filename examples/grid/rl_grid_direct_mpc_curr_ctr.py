@@ -12,10 +12,11 @@ import numpy as np
 
 ## -------------------------------------------------------------------- ##
 # These allow using soft4pes from this folder
-# Get the directory of the current file and add the grandparent directory
-# (soft4pes) to the path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-system.path.append(os.path.abspath(os.path.join(current_dir, '..', '..')))
+# Add the grandparent directory of the current file (soft4pes) to the path,
+# unless it is already there
+soft4pes_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if soft4pes_dir not in system.path:
+    system.path.append(soft4pes_dir)
 ## -------------------------------------------------------------------- ##
 
 from soft4pes import model
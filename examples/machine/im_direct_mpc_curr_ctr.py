@@ -12,10 +12,11 @@ import numpy as np
 
 ## -------------------------------------------------------------------- ##
 # These allow using soft4pes from this folder
-# Get the directory of the current file and add the grandparent directory
-# (soft4pes) to the path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-system.path.append(os.path.abspath(os.path.join(current_dir, '..', '..')))
+# Add the grandparent directory of the current file (soft4pes) to the path,
+# unless it is already there
+soft4pes_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if soft4pes_dir not in system.path:
+    system.path.append(soft4pes_dir)
 ## -------------------------------------------------------------------- ##
 
 from soft4pes import model
@@ -54,16 +55,21 @@ sys = model.machine.InductionMachine(par=im_params,
 
 conv = model.conv.Converter(v_dc_SI=600, nl=3, base=base)
 
-# Define solver to be enumeration based
-solver = mpc.solvers.MpcEnum(conv=conv)
+# Define prediction horizon
+Np = 1
 
-# Uncomment to use Branch-and-Bound solver
-# solver = mpc.solvers.MpcBnB(conv=conv)
+# Define solver. The number of switching sequences grows as nl^(3*Np), so enumeration is used only
+# for a one-step horizon. For longer horizons, Branch-and-Bound prunes the sequences whose partial
+# cost already exceeds the lowest cost found.
+if Np >= 2:
+    solver = mpc.solvers.MpcBnB(conv=conv)
+else:
+    solver = mpc.solvers.MpcEnum(conv=conv)
 
 # Define controller
 ctr = mpc.controllers.IMMpcCurrCtr(solver,
                                    lambda_u=10e-3,
-                                   Np=1,
+                                   Np=Np,
                                    Ts=100e-6,
                                    T_ref=T_ref_seq)
 
@@ -117,27 +117,28 @@ class IMMpcCurrCtr:
 
     def get_next_state(self, sys, xk, uk_abc, k):
         """
-        Calculate the next state of the system.
+        Calculate the next state of the system. The next states of N candidates can be computed
+        at once by stacking the states and/or the inputs row-wise.
 
         Parameters
         ----------
         sys : system object
             The system object, not used in this method.
-        xk : 1 x 2 ndarray of floats
+        xk : 1 x 4 or N x 4 ndarray of floats
             The current state of the system [p.u.] (step k).
-        uk_abc : 1 x 3 ndarray of floats
+        uk_abc : 1 x 3 or N x 3 ndarray of floats
             Converter three-phase switch position or modulating signal.
         k : int
             The solver prediction step. Not used in this method.
 
         Returns
         -------
-        1 x 2 ndarray of floats
+        1 x 4 or N x 4 ndarray of floats
             The next state of the system [p.u.] (step k+1).
         """
 
-        return np.dot(self.state_space.A, xk) + np.dot(self.state_space.B,
-                                                       uk_abc)
+        return np.dot(xk, self.state_space.A.T) + np.dot(
+            uk_abc, self.state_space.B.T)
 
     def save_data(self, iS_ref, uk_abc, T_ref, kTs):
         """
@@ -41,6 +41,8 @@ class RLGridMpcCurrCtr:
         Solver for MPC.
     vg : 1 x 2 ndarray of floats
         Grid voltage [p.u.].
+    vg_pred : Np x 2 ndarray of floats
+        Grid voltage predicted over the prediction horizon [p.u.].
     C : 2 x 2 ndarray of ints
         Output matrix.
     data_sim : dict
@@ -56,6 +58,7 @@ class RLGridMpcCurrCtr:
         self.state_space = SimpleNamespace()
         self.solver = solver
         self.vg = np.array([0, 0])
+        self.vg_pred = np.zeros((Np, 2))
 
         # Output matrix
         self.C = np.array([[1, 0], [0, 1]])
@@ -91,6 +94,15 @@ class RLGridMpcCurrCtr:
         # Get the grid voltage and save it for future use
         self.vg = sys.get_grid_voltage(kTs)
 
+        # Predict the grid voltage over the prediction horizon by rotating it. The prediction is
+        # the same for all candidate switching sequences, so it is computed once per step
+        Ts_pu = self.Ts * sys.base.w
+        for k in range(self.Np):
+            delta_theta = k * sys.par.wg * Ts_pu
+            R = np.array([[np.cos(delta_theta), -np.sin(delta_theta)], \
+                          [np.sin(delta_theta), np.cos(delta_theta)]])
+            self.vg_pred[k] = np.dot(R, self.vg)
+
         # Get the reference for current step
         i_ref_dq = self.i_ref_seq_dq(kTs)
 
@@ -100,7 +112,6 @@ class RLGridMpcCurrCtr:
 
         # Predict the current reference over the prediction horizon
         # Make a rotation matrix
-        Ts_pu = self.Ts * sys.base.w
         delta_theta = sys.par.wg * Ts_pu
         R_ref = np.array([[np.cos(delta_theta), -np.sin(delta_theta)], \
                           [np.sin(delta_theta), np.cos(delta_theta)]])
@@ -121,35 +132,32 @@ class RLGridMpcCurrCtr:
 
     def get_next_state(self, sys, xk, uk_abc, k):
         """
-        Get the next state of the system.
+        Get the next state of the system. The next states of N candidates can be computed at
+        once by stacking the states and/or the inputs row-wise.
 
         Parameters
         ----------
         sys : system object
-            The system model.
-        xk : 1 x 2 ndarray of floats
+            The system model, not used in this method.
+        xk : 1 x 2 or N x 2 ndarray of floats
             The current state of the system.
-        uk_abc : 1 x 3 ndarray of floats
+        uk_abc : 1 x 3 or N x 3 ndarray of floats
             Converter three-phase switch position or modulating signal.
         k : int
             The solver prediction step.
 
         Returns
         -------
-        1 x 2 ndarray of floats
+        1 x 2 or N x 2 ndarray of floats
             The next state of the system.
         """
 
-        # Get the grid voltage at step k by rotating it
-        Ts_pu = self.Ts * sys.base.w
-        delta_theta = k * sys.par.wg * Ts_pu
-        R = np.array([[np.cos(delta_theta), -np.sin(delta_theta)], \
-                        [np.sin(delta_theta), np.cos(delta_theta)]])
-
-        vg_k = np.dot(R, self.vg)
+        # Get the predicted grid voltage at step k
+        vg_k = self.vg_pred[k]
 
-        return np.dot(self.state_space.A, xk) + np.dot(
-            self.state_space.B1, uk_abc) + np.dot(self.state_space.B2, vg_k)
+        return np.dot(xk, self.state_space.A.T) + np.dot(
+            uk_abc, self.state_space.B1.T) + np.dot(vg_k,
+                                                    self.state_space.B2.T)
 
     def save_data(self, ig_ref, uk_abc, kTs):
         """
@@ -1,8 +1,9 @@
 """Branch-and-bound solver for model predictive control (MPC)."""
 
-from itertools import product
 import numpy as np
-from soft4pes.control.mpc.solvers.utils import switching_constraint_violated
+from soft4pes.control.mpc.solvers.utils import (calc_sequence_cost,
+                                                calc_stage_cost,
+                                                switching_constraint_violated)
 
 
 class MpcBnB:
@@ -13,6 +14,12 @@ class MpcBnB:
     ----------
     conv : converter object
         Converter model.
+    warm_start : bool, optional
+        If True, the search is initialized with the previous optimal switching sequence shifted by
+        one step, whose cost is an upper bound for the minimum cost. The default is True. The
+        minimum cost is the same with and without the warm start. However, if several switching
+        sequences have exactly the same minimum cost, the warm start keeps the shifted sequence,
+        while the search alone returns the first one in the enumeration order.
 
     Attributes
     ----------
@@ -22,23 +29,21 @@ class MpcBnB:
         Sequence of three-phase switch positions (switching sequence) with the lowest cost.
     U_temp : 1 x 3*Np ndarray of ints
         Temporary array for incumbent swithing sequence.
-    SW_COMB : 1 x conv.nl^3 ndarray of ints
+    SW_COMB : conv.nl^3 x 3 ndarray of ints
         All possible three-phase switch positions.
+    warm_start : bool
+        If True, the search is initialized with the shifted previous optimal switching sequence.
     """
 
-    def __init__(self, conv):
+    def __init__(self, conv, warm_start=True):
+        if conv.SW_COMB is None:
+            raise ValueError(
+                "The MPC solvers support only 2- and 3-level converters.")
         self.J_min = np.inf
         self.U_seq = None
         self.U_temp = None
-
-        if conv.nl == 2:
-            sw_pos_3ph = np.array([-1, 1])
-
-        elif conv.nl == 3:
-            sw_pos_3ph = np.array([-1, 0, 1])
-
-        # Create all possible three-phase switch positions
-        self.SW_COMB = np.array(list(product(sw_pos_3ph, repeat=3)))
+        self.SW_COMB = conv.SW_COMB
+        self.warm_start = warm_start
 
     def __call__(self, sys, conv, ctr, y_ref):
         """
@@ -61,10 +66,22 @@ class MpcBnB:
             The three-phase switch position.
         """
 
+        U_seq_prev = self.U_seq
         self.J_min = np.inf
         self.U_seq = np.zeros(3 * ctr.Np)
         self.U_temp = np.zeros(3 * ctr.Np)
 
+        # Shift the previous optimal switching sequence by one step and repeat its last three-phase
+        # switch position. Its cost is used as the initial minimum cost, so that branches that
+        # cannot improve on it are pruned from the start of the search.
+        if self.warm_start and U_seq_prev is not None and len(
+                U_seq_prev) == 3 * ctr.Np:
+            U_ws = np.concatenate((U_seq_prev[3:], U_seq_prev[-3:]))
+            J_ws = calc_sequence_cost(sys, conv, ctr, U_ws, y_ref)
+            if J_ws < np.inf:
+                self.U_seq[:] = U_ws
+                self.J_min = J_ws
+
         self.solve(sys, conv, ctr, sys.x, y_ref, ctr.u_km1_abc)
 
         uk_abc = self.U_seq[0:3]
@@ -102,33 +119,28 @@ class MpcBnB:
             Previous cost. The default is 0.
         """
 
-        # Iterate over all possible three-phase switch positions
-        for u_ell_abc in self.SW_COMB:
-
-            # Check if switching constraint is violated or cost is infinite
-            if not switching_constraint_violated(conv.nl, u_ell_abc,
-                                                 u_ell_abc_prev):
-
-                # Compute the next state
-                x_ell_next = ctr.get_next_state(sys, x_ell, u_ell_abc, ell)
-
-                # Calculate the cost of reference tracking and control effort
-                y_ell_next = np.dot(ctr.C, x_ell_next)
-                y_error = np.linalg.norm(y_ref[ell + 1] - y_ell_next)**2
-                delta_u = np.linalg.norm(u_ell_abc - u_ell_abc_prev, ord=1)
-                J_temp = J_prev + y_error + ctr.lambda_u * delta_u
-
-                # if the cost is smaller than the current minimum cost, continue
-                if J_temp < self.J_min:
-
-                    # If not at the last prediction step, move to the next prediction step
-                    if ell < ctr.Np - 1:
-                        self.U_temp[3 * ell:3 * (ell + 1)] = u_ell_abc
-                        self.solve(sys, conv, ctr, x_ell_next, y_ref,
-                                   u_ell_abc, ell + 1, J_temp)
-                    else:
-                        # If at the last prediction step, store the three-phase switch position and
-                        # update the minimum cost
-                        self.U_temp[3 * ell:3 * (ell + 1)] = u_ell_abc
-                        self.U_seq = np.copy(self.U_temp)
-                        self.J_min = J_temp
+        # Compute the next states and the costs of reference tracking and control effort for all
+        # three-phase switch positions that do not violate the switching constraint at once
+        SW_feasible = self.SW_COMB[~switching_constraint_violated(
+            conv.nl, self.SW_COMB, u_ell_abc_prev)]
+        x_ell_next = ctr.get_next_state(sys, x_ell, SW_feasible, ell)
+        J_temp = J_prev + calc_stage_cost(ctr, x_ell_next, y_ref[ell + 1],
+                                          SW_feasible, u_ell_abc_prev)
+
+        # Iterate over the feasible three-phase switch positions
+        for i, u_ell_abc in enumerate(SW_feasible):
+
+            # if the cost is smaller than the current minimum cost, continue
+            if J_temp[i] < self.J_min:
+
+                # If not at the last prediction step, move to the next prediction step
+                if ell < ctr.Np - 1:
+                    self.U_temp[3 * ell:3 * (ell + 1)] = u_ell_abc
+                    self.solve(sys, conv, ctr, x_ell_next[i], y_ref, u_ell_abc,
+                               ell + 1, J_temp[i])
+                else:
+                    # If at the last prediction step, store the three-phase switch position and
+                    # update the minimum cost
+                    self.U_temp[3 * ell:3 * (ell + 1)] = u_ell_abc
+                    self.U_seq[:] = self.U_temp
+                    self.J_min = J_temp[i]
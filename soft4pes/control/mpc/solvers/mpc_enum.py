@@ -2,7 +2,9 @@
 
 from itertools import product
 import numpy as np
-from soft4pes.control.mpc.solvers.utils import switching_constraint_violated
+from soft4pes.control.mpc.solvers.utils import (calc_sequence_cost,
+                                                calc_stage_cost,
+                                                switching_constraint_violated)
 
 
 class MpcEnum:
@@ -16,19 +18,22 @@ class MpcEnum:
 
     Attributes
     ----------
-    U_seq : 3*Np x conv.nl^(3*Np) ndarray of ints
-        Array for sequences of three-phase switch positions (switching sequences).
-    sw_pos_3ph : 1 x conv.nl ndarray of ints
-        Possible one-phase switch positions.
+    U_seq : conv.nl^(3*Np) x 3*Np ndarray of ints
+        Read-only array for sequences of three-phase switch positions (switching sequences).
+    U_seq_feasible : conv.nl^(3*Np) x 1 ndarray of bools
+        True for the switching sequences that do not violate the switching constraint between
+        their own prediction steps.
+    min_index : int or None
+        Index of the switching sequence with the lowest cost at the previous step.
     """
 
     def __init__(self, conv):
+        if conv.SW_COMB is None:
+            raise ValueError(
+                "The MPC solvers support only 2- and 3-level converters.")
         self.U_seq = None
-        if conv.nl == 2:
-            self.sw_pos_3ph = np.array([-1, 1])
-
-        elif conv.nl == 3:
-            self.sw_pos_3ph = np.array([-1, 0, 1])
+        self.U_seq_feasible = None
+        self.min_index = None
 
     def __call__(self, sys, conv, ctr, y_ref):
         """
@@ -53,19 +58,48 @@ class MpcEnum:
 
         # Initialize array for switching sequences
         if self.U_seq is None:
-            self.U_seq = np.array(
-                list(product(self.sw_pos_3ph, repeat=3 * ctr.Np)))
+            self.init_switching_sequences(conv, ctr.Np)
 
         J = self.solve(sys, conv, ctr, sys.x, y_ref, ctr.u_km1_abc)
 
         # Find the switching sequences with the lowest cost
-        min_index = np.argmin(J)
-        uk_abc = self.U_seq[min_index, 0:3]
+        self.min_index = np.argmin(J)
+        uk_abc = self.U_seq[self.min_index, 0:3]
         return uk_abc
 
+    def init_switching_sequences(self, conv, Np):
+        """
+        Create all switching sequences and check once which of them violate the switching
+        constraint between their own prediction steps. Only the first three-phase switch position
+        of a sequence then needs to be checked against the previously applied one.
+
+        Parameters
+        ----------
+        conv : converter object
+            Converter model.
+        Np : int
+            Prediction horizon.
+        """
+
+        self.U_seq = np.array(
+            [np.concatenate(u_seq) for u_seq in product(conv.SW_COMB, repeat=Np)])
+
+        self.U_seq_feasible = np.ones(len(self.U_seq), dtype=bool)
+        for ell in range(1, Np):
+            self.U_seq_feasible &= ~switching_constraint_violated(
+                conv.nl, self.U_seq[:, 3 * ell:3 * (ell + 1)],
+                self.U_seq[:, 3 * (ell - 1):3 * ell])
+
+        # The returned three-phase switch positions are views into U_seq, so it is made read-only
+        self.U_seq.setflags(write=False)
+
     def solve(self, sys, conv, ctr, xk, y_ref, u_km1_abc):
         """
-        Recursively compute the cost for different switching sequences
+        Compute the cost for all switching sequences at once. The switching sequences are
+        stacked row-wise, so that each prediction step is evaluated for all of them with a few
+        array operations. The cost of the previous optimal switching sequence shifted by one step
+        is an upper bound for the minimum cost, and the sequences whose cost exceeds it are
+        discarded after each prediction step.
 
         Parameters
         ----------
@@ -86,39 +120,57 @@ class MpcEnum:
         Returns
         -------
         J : 1 x nl^(3*Np) ndarray of floats
-            Cost array.
+            Cost array. The cost is infinite for the switching sequences that violate the switching
+            constraint or that were discarded, because their cost exceeded the upper bound.
         """
 
         # Initialize the cost array
-        J = np.zeros((conv.nl**(3 * ctr.Np), 1))
-
-        # Iterate over all possible switching sequences and three-phase switch positionss
-        for i, u_seq in enumerate(self.U_seq):
-            for ell in range(ctr.Np):
-                u_ell_abc = u_seq[3 * ell:3 * (ell + 1)]
-
-                # Update the state and the previous three-phase switch position
-                if ell == 0:
-                    u_ell_abc_prev = u_km1_abc
-                    x_ell = xk
-                else:
-                    x_ell = x_ell_next
-                    u_ell_abc_prev = u_seq[3 * (ell - 1):3 * ell]
-
-                # Check if switching constraint is violated or the cost is already infinite
-                if switching_constraint_violated(
-                        conv.nl, u_ell_abc, u_ell_abc_prev) or J[i] == np.inf:
-                    # Set the cost to infinity and the next state to infinity
-                    J[i] = np.inf
-                    x_ell_next = np.full_like(x_ell, np.inf)
-                else:
-                    # Compute the next state
-                    x_ell_next = ctr.get_next_state(sys, x_ell, u_ell_abc, ell)
-
-                    # Calculate the cost of the reference tracking and the control effort
-                    y_ell_next = np.dot(ctr.C, x_ell_next)
-                    y_error = np.linalg.norm(y_ref[ell + 1] - y_ell_next)**2
-                    delta_u = np.linalg.norm(u_ell_abc - u_ell_abc_prev, ord=1)
-                    J[i] += y_error + ctr.lambda_u * delta_u
-
+        J = np.full((conv.nl**(3 * ctr.Np), 1), np.inf)
+
+        # Evaluate only the sequences that satisfy the switching constraint. Later prediction
+        # steps have already been checked in init_switching_sequences.
+        feasible = self.U_seq_feasible & ~switching_constraint_violated(
+            conv.nl, self.U_seq[:, 0:3], u_km1_abc)
+        index = np.flatnonzero(feasible)
+        U_seq = self.U_seq[index]
+
+        # The previous optimal switching sequence shifted by one step, with its last three-phase
+        # switch position repeated, is found from the index of the previous optimum, since the
+        # sequences are ordered like the digits of a number in base nl^3
+        J_bound = np.inf
+        i_ws = -1
+        if self.min_index is not None:
+            n_sw = conv.nl**3
+            i_ws = (self.min_index % n_sw**(ctr.Np - 1)) * n_sw + (
+                self.min_index % n_sw)
+            if feasible[i_ws]:
+                J_bound = calc_sequence_cost(sys, conv, ctr, self.U_seq[i_ws],
+                                             y_ref)
+
+        J_feasible = np.zeros(len(U_seq))
+        x_ell = xk
+        u_ell_abc_prev = u_km1_abc
+        for ell in range(ctr.Np):
+            u_ell_abc = U_seq[:, 3 * ell:3 * (ell + 1)]
+
+            # Compute the next states, one row per switching sequence
+            x_ell = ctr.get_next_state(sys, x_ell, u_ell_abc, ell)
+
+            # Calculate the cost of the reference tracking and the control effort
+            J_feasible += calc_stage_cost(ctr, x_ell, y_ref[ell + 1], u_ell_abc,
+                                          u_ell_abc_prev)
+
+            # The cost cannot decrease over the prediction horizon, so the sequences whose cost
+            # already exceeds the bound are discarded before the next prediction step. The
+            # shifted sequence itself is always kept, so that rounding cannot discard all of them.
+            if ell < ctr.Np - 1:
+                keep = (J_feasible <= J_bound) | (index == i_ws)
+                index = index[keep]
+                U_seq = U_seq[keep]
+                J_feasible = J_feasible[keep]
+                x_ell = x_ell[keep]
+
+            u_ell_abc_prev = U_seq[:, 3 * ell:3 * (ell + 1)]
+
+        J[index, 0] = J_feasible
         return J
@@ -7,26 +7,99 @@ def switching_constraint_violated(nl, uk_abc, u_km1_abc):
     """
     Check if a candidate three-phase switch position violates a switching constraint. 
     A three-level converter is not allowed to directly switch from -1 and 1 (and vice versa) 
-    on one phase. 
+    on one phase. Several candidates can be checked at once by stacking them row-wise.
 
     Parameters
     ----------
     nl : int
         Number of converter voltage levels.
-    uk_abc : 1 x 3 ndarray of ints
-        three-phase switch position.
-    u_km1_abc : 1 x 3 ndarray of ints
-        Previously applied three-phase switch position.
+    uk_abc : 1 x 3 or N x 3 ndarray of ints
+        three-phase switch position(s).
+    u_km1_abc : 1 x 3 or N x 3 ndarray of ints
+        Previously applied three-phase switch position(s).
 
     Returns
     -------
-    bool
+    bool or N x 1 ndarray of bools
         Constraint violated.
     """
 
     if nl == 2:
-        res = False
+        res = np.zeros(np.shape(uk_abc)[:-1], dtype=bool)
     elif nl == 3:
-        res = np.linalg.norm(uk_abc - u_km1_abc, np.inf) >= 2
+        res = np.max(np.abs(uk_abc - u_km1_abc), axis=-1) >= 2
 
     return res
+
+
+def calc_stage_cost(ctr, x_ell_next, y_ref_ell_next, u_ell_abc,
+                    u_ell_abc_prev):
+    """
+    Calculate the cost of reference tracking and control effort of one prediction step. The
+    costs of N candidates can be calculated at once by stacking the states and three-phase switch
+    positions row-wise.
+
+    Parameters
+    ----------
+    ctr : controller object
+        Controller object.
+    x_ell_next : 1 x nx or N x nx ndarray of floats
+        Predicted state(s) at step ell+1 [p.u.].
+    y_ref_ell_next : 1 x ny ndarray of floats
+        Reference at step ell+1 [p.u.].
+    u_ell_abc : 1 x 3 or N x 3 ndarray of ints
+        Three-phase switch position(s) at step ell.
+    u_ell_abc_prev : 1 x 3 or N x 3 ndarray of ints
+        Three-phase switch position(s) at step ell-1.
+
+    Returns
+    -------
+    float or N x 1 ndarray of floats
+        Stage cost.
+    """
+
+    y_ell_next = np.dot(x_ell_next, ctr.C.T)
+    y_error = np.sum((y_ref_ell_next - y_ell_next)**2, axis=-1)
+    delta_u = np.sum(np.abs(u_ell_abc - u_ell_abc_prev), axis=-1)
+    return y_error + ctr.lambda_u * delta_u
+
+
+def calc_sequence_cost(sys, conv, ctr, U_seq, y_ref):
+    """
+    Calculate the cost of a single switching sequence over the prediction horizon, starting from
+    the current state of the system and the previously applied three-phase switch position.
+
+    Parameters
+    ----------
+    sys : system object
+        System model.
+    conv : converter object
+        Converter model.
+    ctr : controller object
+        Controller object.
+    U_seq : 1 x 3*Np ndarray of ints
+        Switching sequence.
+    y_ref : ndarray of floats
+        Reference vector [p.u.].
+
+    Returns
+    -------
+    float
+        Cost of the switching sequence. The cost is infinite if the sequence violates the
+        switching constraint.
+    """
+
+    J = 0
+    x_ell = sys.x
+    u_ell_abc_prev = ctr.u_km1_abc
+    for ell in range(ctr.Np):
+        u_ell_abc = U_seq[3 * ell:3 * (ell + 1)]
+        if switching_constraint_violated(conv.nl, u_ell_abc, u_ell_abc_prev):
+            return np.inf
+
+        x_ell = ctr.get_next_state(sys, x_ell, u_ell_abc, ell)
+        J += calc_stage_cost(ctr, x_ell, y_ref[ell + 1], u_ell_abc,
+                             u_ell_abc_prev)
+        u_ell_abc_prev = u_ell_abc
+
+    return J
@@ -3,6 +3,7 @@ System base class
 """
 from abc import ABC, abstractmethod
 from types import SimpleNamespace
+import numpy as np
 
 
 class SystemModel(ABC):
@@ -14,24 +15,63 @@ class SystemModel(ABC):
     ----------
     base : base value object
         Base values.
-    data : SimpleNamespace
-        Namespace for storing simulation data.
+    data_buffers : dict
+        Preallocated arrays for storing simulation data. The first dimension of each array is
+        the simulation step. The data type of an array is widened (e.g. from ints to floats) when
+        a value of a wider type is stored in it, so that no value is truncated.
+    n_data : int
+        Number of simulation steps stored in the data buffers.
+    data_size : int
+        Number of simulation steps the data buffers have been allocated for.
     par : system parameters
         System parameters in p.u..
+    state_space_cache : dict
+        Discrete-time state-space models already computed, keyed by the dc-link voltage and the
+        sampling interval.
     x : ndarray
         Current state of the system.
     """
 
     def __init__(self, par, base):
         self.base = base
-        self.data = SimpleNamespace(x=[], t=[], uk_abc=[])
+        self.data_buffers = {}
+        self.n_data = 0
+        self.data_size = 0
         self.par = par
+        self.state_space_cache = {}
         self.x = 0
 
-    @abstractmethod
     def get_discrete_state_space(self, v_dc, Ts):
         """
-        Calculates the discrete-time state-space model of the system.
+        Get the discrete-time state-space model of the system. The model only depends on the
+        dc-link voltage and the sampling interval, so it is stored in state_space_cache and
+        reused in subsequent calls. The matrices of the model are read-only, as the same model is
+        shared by all callers.
+
+        Parameters
+        ----------
+        v_dc : float
+            The converter dc-link voltage [p.u.].
+        Ts : float
+            Sampling interval [s].
+
+        Returns
+        -------
+        SimpleNamespace
+            The discrete-time state-space model of the system.
+        """
+
+        if (v_dc, Ts) not in self.state_space_cache:
+            matrices = self._calc_discrete_state_space(v_dc, Ts)
+            for matrix in matrices.__dict__.values():
+                matrix.setflags(write=False)
+            self.state_space_cache[(v_dc, Ts)] = matrices
+        return self.state_space_cache[(v_dc, Ts)]
+
+    @abstractmethod
+    def _calc_discrete_state_space(self, v_dc, Ts):
+        """
+        Calculate the discrete-time state-space model of the system.
 
         Parameters
         ----------
@@ -67,6 +107,30 @@ class SystemModel(ABC):
             Current discrete time instant [s].
         """
 
+    def update_states(self, matrices, uk_abc, kTs, Ts, N):
+        """
+        Get the next N states of the system, while the converter three-phase switch position or
+        modulating signal is kept constant, e.g. over one control interval. The default
+        implementation calls update_state N times. Models can override this method to compute the
+        inputs, measurements and data of the N steps at once.
+
+        Parameters
+        ----------
+        matrices : SimpleNamespace
+            A SimpleNamespace object containing the state-space model matrices.
+        uk_abc : 1 x 3 ndarray of floats
+            Converter three-phase switch position or modulating signal.
+        kTs : float
+            Discrete time instant of the first step [s].
+        Ts : float
+            Sampling interval of the state-space model [s].
+        N : int
+            Number of steps.
+        """
+
+        for n in range(N):
+            self.update_state(matrices, uk_abc, kTs + n * Ts)
+
     def update(self, x_kp1, uk_abc, kTs, meas=None):
         """
         Update the system state and save data.
@@ -86,9 +150,98 @@ class SystemModel(ABC):
         self.save_data(kTs, uk_abc, meas)
         self.x = x_kp1
 
+    def update_block(self, x_block, uk_abc, t_block, meas=None):
+        """
+        Update the system state after N steps and save the data of the steps.
+
+        Parameters
+        ----------
+        x_block : N+1 x nx ndarray of floats
+            States at steps 0, ..., N, where the state at step 0 is the current state.
+        uk_abc : 1 x 3 ndarray of floats
+            Converter three-phase switch position or modulating signal, constant over the steps.
+        t_block : N x 1 ndarray of floats
+            Discrete time instants of the steps 0, ..., N-1 [s].
+        meas : SimpleNamespace, optional
+            Measurement data. The first dimension of each quantity is the step.
+        """
+
+        self.save_data_block(t_block, x_block[:-1], uk_abc, meas)
+        self.x = x_block[-1]
+
+    @property
+    def data(self):
+        """
+        Simulation data, i.e. the state x, time t, converter three-phase switch position or
+        modulating signal uk_abc and measurements. Each quantity is an array, whose first
+        dimension is the simulation step.
+
+        Returns
+        -------
+        SimpleNamespace
+            Simulation data.
+        """
+
+        return SimpleNamespace(**{
+            key: buffer[:self.n_data]
+            for key, buffer in self.data_buffers.items()
+        })
+
+    def allocate_data(self, N):
+        """
+        Allocate the data buffers for N more simulation steps. Data already stored in the buffers
+        is kept.
+
+        Parameters
+        ----------
+        N : int
+            Number of simulation steps.
+        """
+
+        size = self.n_data + N
+        if size <= self.data_size:
+            return
+
+        for key, buffer in self.data_buffers.items():
+            new_buffer = np.zeros((size, ) + buffer.shape[1:],
+                                  dtype=buffer.dtype)
+            new_buffer[:self.n_data] = buffer[:self.n_data]
+            self.data_buffers[key] = new_buffer
+        self.data_size = size
+
+    def get_data_buffer(self, key, value, shape):
+        """
+        Get the data buffer of a quantity for storing a value. The buffer is created on the first
+        call, and its data type is widened if the value cannot be stored in it without loss.
+
+        Parameters
+        ----------
+        key : str
+            Name of the quantity.
+        value : ndarray or float
+            Value(s) to be stored.
+        shape : tuple of ints
+            Shape of the quantity at a single simulation step.
+
+        Returns
+        -------
+        ndarray
+            Data buffer of the quantity.
+        """
+
+        buffer = self.data_buffers.get(key)
+        if buffer is None:
+            buffer = np.zeros((self.data_size, ) + shape,
+                              dtype=np.result_type(value))
+            self.data_buffers[key] = buffer
+        elif not np.can_cast(np.result_type(value), buffer.dtype):
+            buffer = buffer.astype(np.result_type(buffer.dtype, value))
+            self.data_buffers[key] = buffer
+        return buffer
+
     def save_data(self, kTs, uk_abc, meas):
         """
-        Save simulation data.
+        Save simulation data. If the data buffers are full, their size is doubled.
 
         Parameters
         ----------
@@ -100,11 +253,50 @@ class SystemModel(ABC):
             Measurement data.
         """
 
-        self.data.x.append(self.x)
-        self.data.t.append(kTs)
-        self.data.uk_abc.append(uk_abc)
+        if self.n_data >= self.data_size:
+            self.allocate_data(max(self.n_data, 1))
+
+        data = {'x': self.x, 't': kTs, 'uk_abc': uk_abc}
+        if meas is not None:
+            data.update(meas.__dict__)
+
+        for key, value in data.items():
+            buffer = self.get_data_buffer(key, value, np.shape(value))
+            buffer[self.n_data] = value
+
+        self.n_data += 1
+
+    def save_data_block(self, t_block, x_block, uk_abc, meas):
+        """
+        Save simulation data of N steps at once. If the data buffers are too small, their size is
+        at least doubled.
+
+        Parameters
+        ----------
+        t_block : N x 1 ndarray of floats
+            Discrete time instants of the steps [s].
+        x_block : N x nx ndarray of floats
+            States at the steps.
+        uk_abc : 1 x 3 ndarray of floats
+            Converter three-phase switch position or modulating signal, constant over the steps.
+        meas : SimpleNamespace, optional
+            Measurement data. The first dimension of each quantity is the step.
+        """
+
+        N = len(t_block)
+        if self.n_data + N > self.data_size:
+            self.allocate_data(max(self.n_data, N))
+
+        data = {
+            'x': x_block,
+            't': t_block,
+            'uk_abc': np.broadcast_to(uk_abc, (N, ) + np.shape(uk_abc))
+        }
         if meas is not None:
-            for key, value in meas.__dict__.items():
-                if not hasattr(self.data, key):
-                    setattr(self.data, key, [])
-                getattr(self.data, key).append(value)
+            data.update(meas.__dict__)
+
+        for key, value in data.items():
+            buffer = self.get_data_buffer(key, value, np.shape(value)[1:])
+            buffer[self.n_data:self.n_data + N] = value
+
+        self.n_data += N
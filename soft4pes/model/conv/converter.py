@@ -2,6 +2,9 @@
 n-level converter model.
 """
 
+from itertools import product
+import numpy as np
+
 
 class Converter:
     """ 
@@ -24,10 +27,21 @@ class Converter:
         Dc-link voltage [p.u.]
     nl : int
         Number of voltage levels in the converter.
-    SW_COMB : 3^nl x 3 ndarray of ints
-        Possible converter three-phase switch positions.
+    SW_COMB : nl^3 x 3 ndarray of ints or None
+        Possible converter three-phase switch positions. Only defined for 2- and 3-level
+        converters, None otherwise.
     """
 
     def __init__(self, v_dc_SI, nl, base):
         self.v_dc = v_dc_SI / base.V
         self.nl = nl
+
+        # Create all possible three-phase switch positions
+        if nl == 2:
+            sw_pos = np.array([-1, 1])
+            self.SW_COMB = np.array(list(product(sw_pos, repeat=3)))
+        elif nl == 3:
+            sw_pos = np.array([-1, 0, 1])
+            self.SW_COMB = np.array(list(product(sw_pos, repeat=3)))
+        else:
+            self.SW_COMB = None
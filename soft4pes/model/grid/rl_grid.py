@@ -2,9 +2,8 @@
 
 from types import SimpleNamespace
 import numpy as np
-from soft4pes.utils import abc_2_alpha_beta
 from soft4pes.model.common.system_model import SystemModel
-from soft4pes.utils.conversions import dq_2_alpha_beta
+from soft4pes.utils.conversions import CLARKE, dq_2_alpha_beta
 
 
 class RLGrid(SystemModel):
@@ -55,22 +54,18 @@ class RLGrid(SystemModel):
         else:
             self.x = np.zeros(2)
 
-    def get_discrete_state_space(self, v_dc, Ts):
+    def _calc_discrete_state_space(self, v_dc, Ts):
         Rg = self.par.Rg
         Xg = self.par.Xg
-        Ts = Ts * self.base.w
-
-        # Clarke transformation matrix
-        K = (2 / 3) * np.array([[1, -1 / 2, -1 / 2],
-                                [0, np.sqrt(3) / 2, -np.sqrt(3) / 2]])
+        Ts_pu = Ts * self.base.w
 
         F = -Rg / Xg * np.eye(2)
-        G1 = v_dc / 2 * 1 / Xg * K
+        G1 = v_dc / 2 * 1 / Xg * CLARKE
         G2 = -1 / Xg * np.eye(2)
 
-        A = np.eye(2) + F * Ts
-        B1 = G1 * Ts
-        B2 = G2 * Ts
+        A = np.eye(2) + F * Ts_pu
+        B1 = G1 * Ts_pu
+        B2 = G2 * Ts_pu
 
         return SimpleNamespace(A=A, B1=B1, B2=B2)
 
@@ -80,12 +75,12 @@ class RLGrid(SystemModel):
 
         Parameters
         ----------
-        kTs : float
-            Current discrete time instant [s].
+        kTs : float or N x 1 ndarray of floats
+            Current discrete time instant(s) [s].
 
         Returns
         -------
-        1 x 2 ndarray of floats
+        1 x 2 or N x 2 ndarray of floats
             Grid voltage in alpha-beta frame [p.u.].
         """
 
@@ -94,9 +89,9 @@ class RLGrid(SystemModel):
         # Grid peak voltage
         Vg = np.sqrt(2 / 3) * self.par.Vgr
 
-        vg_abc = Vg * np.sin(theta + 2 * np.pi / 3 * np.array([0, -1, 1]))
-
-        vg = abc_2_alpha_beta(vg_abc)
+        # The balanced three-phase voltage Vg * sin(theta + ABC_PHASE_SHIFTS) maps to the
+        # alpha-beta frame in closed form, which avoids the third sine and the Clarke transformation
+        vg = Vg * np.array([np.sin(theta), -np.cos(theta)]).T
         return vg
 
     def update_state(self, matrices, uk_abc, kTs):
@@ -105,3 +100,20 @@ class RLGrid(SystemModel):
             matrices.B1, uk_abc) + np.dot(matrices.B2, vg)
         meas = SimpleNamespace(vg=vg)
         super().update(x_kp1, uk_abc, kTs, meas)
+
+    def update_states(self, matrices, uk_abc, kTs, Ts, N):
+        t_block = kTs + np.arange(N) * Ts
+        vg = self.get_grid_voltage(t_block)
+
+        # The input and grid-voltage terms of all steps are computed at once, so that each step
+        # only adds them to A x written directly into the state buffer without temporary arrays
+        B_w = np.dot(matrices.B1, uk_abc) + np.dot(vg, matrices.B2.T)
+
+        x_block = np.zeros((N + 1, np.size(self.x)))
+        x_block[0] = self.x
+        for n in range(N):
+            np.dot(matrices.A, x_block[n], out=x_block[n + 1])
+            x_block[n + 1] += B_w[n]
+
+        meas = SimpleNamespace(vg=vg)
+        super().update_block(x_block, uk_abc, t_block, meas)
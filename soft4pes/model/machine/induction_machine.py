@@ -5,6 +5,7 @@ Induction machine model. The machine operates at a constant electrical angular r
 from types import SimpleNamespace
 import numpy as np
 from soft4pes.utils import dq_2_alpha_beta
+from soft4pes.utils.conversions import CLARKE
 from soft4pes.model.common.system_model import SystemModel
 
 
@@ -65,6 +66,9 @@ class InductionMachine(SystemModel):
         # flux and rotor speed are calculated
         psiR_dq, self.wr = self.get_steady_state_psir(psiS_mag_ref, T_ref_init)
 
+        # The state-space model depends on the rotor speed, discard models computed before
+        self.state_space_cache.clear()
+
         # Get the initial angle and align the rotor flux vector with d-axis
         theta = np.arctan2(psiR_dq[1], psiR_dq[0])
         psiR_dq = np.array([np.linalg.norm(psiR_dq), 0])
@@ -142,7 +146,7 @@ class InductionMachine(SystemModel):
         iS_q = T_ref / psiR_mag * self.par.Xr / self.par.Xm / self.par.kT
         return np.array([iS_d, iS_q])
 
-    def get_discrete_state_space(self, v_dc, Ts):
+    def _calc_discrete_state_space(self, v_dc, Ts):
         wr = self.wr
         Rs = self.par.Rs
         Rr = self.par.Rr
@@ -154,28 +158,59 @@ class InductionMachine(SystemModel):
 
         Ts_pu = Ts * self.base.w
 
-        K = (2 / 3) * np.array([[1, -1 / 2, -1 / 2],
-                                [0, np.sqrt(3) / 2, -np.sqrt(3) / 2]])
-
         F = np.array([[-1 / tauS, 0, Xm / (tauR * D), wr * Xm / D],
                       [0, -1 / tauS, -wr * Xm / D, Xm / (tauR * D)],
                       [Xm / tauR, 0, -1 / tauR, -wr],
                       [0, Xm / tauR, wr, -1 / tauR]])
 
         G = Xr / D * np.dot(np.array([[1, 0], [0, 1], [0, 0], [0, 0]]),
-                            K) * v_dc / 2
+                            CLARKE) * v_dc / 2
 
         A = np.eye(4) + F * Ts_pu
         B = G * Ts_pu
+
         return SimpleNamespace(A=A, B=B)
 
+    def calc_torque(self, x):
+        """
+        Calculate the electromagnetic torque.
+
+        Parameters
+        ----------
+        x : 1 x 4 or N x 4 ndarray of floats
+            State(s) of the machine [p.u.].
+
+        Returns
+        -------
+        float or N x 1 ndarray of floats
+            Electromagnetic torque [p.u.].
+        """
+
+        iS = x[..., 0:2]
+        psiR = x[..., 2:4]
+        return self.par.kT * (self.par.Xm / self.par.Xr) * (
+            psiR[..., 0] * iS[..., 1] - psiR[..., 1] * iS[..., 0])
+
     @property
     def Te(self):
-        iS = self.x[0:2]
-        psiR = self.x[2:4]
-        return self.par.kT * (self.par.Xm / self.par.Xr) * np.cross(psiR, iS)
+        return self.calc_torque(self.x)
 
     def update_state(self, matrices, uk_abc, kTs):
         meas = SimpleNamespace(Te=self.Te)
         x_kp1 = np.dot(matrices.A, self.x) + np.dot(matrices.B, uk_abc)
         super().update(x_kp1, uk_abc, kTs, meas)
+
+    def update_states(self, matrices, uk_abc, kTs, Ts, N):
+        t_block = kTs + np.arange(N) * Ts
+
+        # The input term is constant over the steps
+        B_uk = np.dot(matrices.B, uk_abc)
+
+        x_block = np.zeros((N + 1, np.size(self.x)))
+        x_block[0] = self.x
+        for n in range(N):
+            np.dot(matrices.A, x_block[n], out=x_block[n + 1])
+            x_block[n + 1] += B_uk
+
+        meas = SimpleNamespace(Te=self.calc_torque(x_block[:-1]))
+        super().update_block(x_block, uk_abc, t_block, meas)
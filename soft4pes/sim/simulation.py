@@ -105,19 +105,27 @@ class Simulation:
             Simulation length [s]. Simulation start time is always 0 s, i.e. kTs = 0.
         """
 
-        progress_printer = ProgressPrinter(int(t_stop / self.ctr.Ts))
         self.t_stop = t_stop
 
-        for k in range(int(self.t_stop / self.ctr.Ts)):
+        # Number of control steps and simulation steps per control step. The latter is rounded, as
+        # the ratio has been verified to be an integer (within tolerance) in the constructor
+        N_ctr = int(self.t_stop / self.ctr.Ts)
+        N_sim = round(self.ctr.Ts / self.Ts_sim)
+
+        # Allocate the system data for the whole simulation at once
+        self.sys.allocate_data(N_ctr * N_sim)
+
+        progress_printer = ProgressPrinter(N_ctr)
+
+        for k in range(N_ctr):
 
             # Execute the controller
             kTs = k * self.ctr.Ts
             uk_abc = self.ctr(self.sys, self.conv, kTs)
 
-            for k_sim in range(int(self.ctr.Ts / self.Ts_sim)):
-
-                kTs_sim = kTs + k_sim * self.Ts_sim
-                self.sys.update_state(self.matrices, uk_abc, kTs_sim)
+            # Simulate the system over the control interval, during which uk_abc is constant
+            self.sys.update_states(self.matrices, uk_abc, kTs, self.Ts_sim,
+                                   N_sim)
 
             progress_printer(k)
 
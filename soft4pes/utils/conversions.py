@@ -4,52 +4,56 @@ Reference-frame conversions.
 
 import numpy as np
 
+# Phase shifts of the a-, b- and c-phase axes [rad]
+ABC_PHASE_SHIFTS = np.array([0, -2 * np.pi / 3, 2 * np.pi / 3])
+
+# Reduced Clarke transformation matrix and its inverse
+CLARKE = (2 / 3) * np.array([[1, -1 / 2, -1 / 2],
+                             [0, np.sqrt(3) / 2, -np.sqrt(3) / 2]])
+CLARKE_INV = np.array([[1, 0], [-1 / 2, np.sqrt(3) / 2],
+                       [-1 / 2, -np.sqrt(3) / 2]])
+
 
 def abc_2_alpha_beta(abc):
     """
     Convert a quantity from abc-frame to alpha-beta frame using the reduced 
-    Clarke transformation. The common-mode component is neglected.
+    Clarke transformation. The common-mode component is neglected. A whole
+    trajectory can be converted at once by giving n samples.
 
     Parameters
     ----------
-    abc : 1 x 3 ndarray of floats
+    abc : 1 x 3 or n x 3 ndarray of floats
         Input quantity in abc-frame. 
 
     Returns
     -------
-    1 x 2 ndarray of floats
+    1 x 2 or n x 2 ndarray of floats
         Quantity in alpha-beta frame. 
     """
 
-    K = (2 / 3) * np.array([[1, -1 / 2, -1 / 2],
-                            [0, np.sqrt(3) / 2, -np.sqrt(3) / 2]])
-
-    ab = np.dot(K, abc)
+    ab = np.dot(abc, CLARKE.T)
 
     return ab
 
 
 def alpha_beta_2_abc(alpha_beta):
     """
-    Convert a quantity from abc-frame to alpha-beta frame using the inverse 
-    reduced Clarke transformation. The common-mode component is neglected.
+    Convert a quantity from alpha-beta frame to abc-frame using the inverse 
+    reduced Clarke transformation. The common-mode component is neglected. A
+    whole trajectory can be converted at once by giving n samples.
 
     Parameters
     ----------
-    abc : 1 x 3 ndarray of floats
-        Input quantity in abc-frame. 
+    alpha_beta : 1 x 2 or n x 2 ndarray of floats
+        Input quantity in alpha-beta frame. 
 
     Returns
     -------
-    1 x 2 ndarray of floats
-        Quantity in alpha-beta frame. 
+    1 x 3 or n x 3 ndarray of floats
+        Quantity in abc-frame. 
     """
 
-    K_inv = np.array([[1, 0], \
-                      [-1 / 2, np.sqrt(3) / 2],
-                      [-1 / 2, -np.sqrt(3) / 2]])
-
-    abc = np.dot(K_inv, alpha_beta)
+    abc = np.dot(alpha_beta, CLARKE_INV.T)
 
     return abc
 
@@ -57,72 +61,83 @@ def alpha_beta_2_abc(alpha_beta):
 def alpha_beta_2_dq(alpha_beta, theta):
     """
     Convert a quantity from alpha-beta frame to dq-frame. The common-mode
-    component is neglected.
+    component is neglected. A whole trajectory can be converted at once by
+    giving n samples and n angles.
 
     Parameters
     ----------
-    alpha_beta : 1 x 2 ndarray of floats
+    alpha_beta : 1 x 2 or n x 2 ndarray of floats
         Quantity in alpha-beta frame. 
-    theta : float
+    theta : float or n x 1 ndarray of floats
         Angle of the reference frame in radians.
 
     Returns
     -------
-    1 x 2 ndarray of floats
+    1 x 2 or n x 2 ndarray of floats
         Quantity in dq-frame.
     """
 
-    R = np.array([[np.cos(theta), np.sin(theta)],
-                  [-np.sin(theta), np.cos(theta)]])
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+    alpha, beta = np.asarray(alpha_beta).T
 
-    return np.dot(R, alpha_beta)
+    return np.array([
+        cos_theta * alpha + sin_theta * beta,
+        -sin_theta * alpha + cos_theta * beta
+    ]).T
 
 
 def dq_2_alpha_beta(dq, theta):
     """
     Convert a quantity from dq-frame to alpha-beta frame. The common-mode
-    component is neglected.
+    component is neglected. A whole trajectory can be converted at once by
+    giving n samples and n angles.
 
     Parameters
     ----------
-    dq : 1 x 2 ndarray of floats
+    dq : 1 x 2 or n x 2 ndarray of floats
         Quantity in dq-frame. 
-    theta : float
+    theta : float or n x 1 ndarray of floats
         Angle of the reference frame in radians.
 
     Returns
     -------
-    1 x 2 ndarray of floats
+    1 x 2 or n x 2 ndarray of floats
         Quantity in alpha-beta frame.
     """
 
-    R_inv = np.array([[np.cos(theta), -np.sin(theta)],
-                      [np.sin(theta), np.cos(theta)]])
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+    d, q = np.asarray(dq).T
 
-    return np.dot(R_inv, dq)
+    return np.array(
+        [cos_theta * d - sin_theta * q, sin_theta * d + cos_theta * q]).T
 
 
 def dq_2_abc(dq, theta):
     """
     Convert a quantity from dq-frame to abc-frame using the inverse reduced Park 
-    trasformation. The common-mode component is neglected.
+    trasformation. The common-mode component is neglected. A whole trajectory
+    can be converted at once by giving n samples and n angles.
 
     Parameters
     ----------
-    dq : 1 x 2 ndarray of floats
+    dq : 1 x 2 or n x 2 ndarray of floats
         Quantity in dq-frame. 
-    theta : float
+    theta : float or n x 1 ndarray of floats
         Angle of the reference frame in radians.
 
     Returns
     -------
-    1 x 3 ndarray of floats
+    1 x 3 or n x 3 ndarray of floats
         Quantity in abc-frame.
     """
 
-    K_inv_theta = np.array(
-        [[np.cos(theta), -np.sin(theta)],
-         [np.cos(theta - (2 * np.pi / 3)), -np.sin(theta - (2 * np.pi / 3))], \
-         [np.cos(theta + (2 * np.pi / 3)), -np.sin(theta + (2 * np.pi / 3))]])
+    # Angles of the a-, b- and c-phase axes, evaluated with a single broadcast call
+    theta_abc = np.add.outer(theta, ABC_PHASE_SHIFTS)
+
+    dq = np.asarray(dq)
+    d = dq[..., 0:1]
+    q = dq[..., 1:2]
 
-    return np.dot(K_inv_theta, dq)
+    return np.cos(theta_abc) * d - np.sin(theta_abc) * q
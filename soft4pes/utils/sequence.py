@@ -2,6 +2,7 @@
 Sequence class can be used to generate a sequence of values over time.
 """
 
+from bisect import bisect_right
 import numpy as np
 
 
@@ -14,9 +15,9 @@ class Sequence:
 
     Parameters
     ----------
-    times : n x 1 ndarray of floats
+    times : n x 1 array_like of floats
         Time instants is seconds.
-    values : n x m ndarray of floats
+    values : n x m array_like of floats
         Output values.
 
     Attributes
@@ -25,25 +26,43 @@ class Sequence:
         Time instants is seconds.
     values : n x m ndarray of floats
         Output values.
+    slopes : n x m ndarray of floats
+        Slopes of the output values between consecutive time instants. The slope after the last
+        time instant and between repeated time instants (steps) is zero.
     """
 
     def __init__(self, times, values):
-        self.times = times
-        self.values = values
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+
+        # Precompute the slopes of the segments, so that the output at a single time instant can
+        # be interpolated for all columns with a single search
+        dt = np.diff(self.times)
+        if self.values.ndim > 1:
+            dt = dt[:, np.newaxis]
+        self.slopes = np.zeros(self.values.shape)
+        np.divide(np.diff(self.values, axis=0),
+                  dt,
+                  out=self.slopes[:-1],
+                  where=dt > 0)
+        self._times_list = self.times.tolist()
 
     def __call__(self, kTs):
         """
-        Interpolate the output.
+        Interpolate the output. The output can be evaluated at a single time instant or at an
+        array of time instants at once, e.g. over the whole simulation time.
 
         Parameters
         ----------
-        kTs : float
-            Current discrete time instant [s].
+        kTs : float or k x 1 array_like of floats
+            Current discrete time instant(s) [s].
 
         Returns
         -------
-        1 x m ndarray of floats
-            Interpolated output.
+        1 x m ndarray of floats or k x m ndarray of floats
+            Interpolated output. A single time instant yields a 1 x m array, an array of k time
+            instants a k x m array. If the values are one dimensional, the output is a float for a
+            single time instant and a one-dimensional array of length k for k time instants.
 
         """
 
@@ -51,10 +70,18 @@ class Sequence:
         if self.values.ndim == 1:
             return np.interp(kTs, self.times, self.values)
 
-        # Perform interpolation for each column
-        interpolated_values = []
-        for m in range(self.values.shape[1]):
-            inter_value = np.interp(kTs, self.times, self.values[:, m])
-            interpolated_values.append(inter_value)
+        # Interpolate an array of time instants column by column
+        if np.ndim(kTs) > 0:
+            kTs = np.asarray(kTs)
+            return np.array([
+                np.interp(kTs, self.times, self.values[:, m])
+                for m in range(self.values.shape[1])
+            ]).T
+
+        # Find the segment of a single time instant once for all columns. The output is held
+        # constant before the first and after the last time instant.
+        j = bisect_right(self._times_list, kTs) - 1
+        if j < 0:
+            j, kTs = 0, self._times_list[0]
 
-        return np.array(interpolated_values)
+        return self.values[j] + self.slopes[j] * (kTs - self._times_list[j])